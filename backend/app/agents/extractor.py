@@ -1,17 +1,11 @@
 # backend/app/agents/extractor.py
-from langchain_groq import ChatGroq
 from langchain.prompts import ChatPromptTemplate
 import json
 import json5
 import re
-import os
 from typing import Dict, Optional
-
-llm = ChatGroq(
-    api_key=os.getenv("GROQ_API_KEY"),
-    model_name="llama-3.3-70b-versatile",
-    temperature=0.2
-)
+from app.services.llm import llm_client
+from app.agents.rule_extractor import rule_based_extract
 
 async def extractor_agent(email_text: str) -> Optional[Dict]:
     """Extract meeting information from email text"""
@@ -57,7 +51,11 @@ EMAIL TO ANALYZE:
 RESPONSE: Return only the JSON object, no additional text or explanations.""")
     
     try:
-        output = llm(prompt.format_messages(text=email_text)).content.strip()
+        output = await llm_client.ainvoke(prompt.format_messages(text=email_text))
+        if output is None:
+            # Provider unavailable or circuit open: degrade to rule-based extraction
+            return rule_based_extract(email_text)
+        
         cleaned = output.replace("```json", "").replace("```", "").strip()
         
         # Try to parse JSON
@@ -1,16 +1,10 @@
 # backend/app/agents/reply_extractor.py
-from langchain_groq import ChatGroq
 from langchain.prompts import ChatPromptTemplate
 import json5
 import re
-import os
 from typing import Dict, List, Optional
-
-llm = ChatGroq(
-    api_key=os.getenv("GROQ_API_KEY"),
-    model_name="llama-3.3-70b-versatile",
-    temperature=0.2
-)
+from app.services.llm import llm_client
+from app.agents.rule_extractor import rule_based_extract
 
 async def reply_extractor_agent(reply_text: str, missing_fields: List[str]) -> Optional[Dict]:
     """Extract specific missing information from client reply emails"""
@@ -34,7 +28,13 @@ CLIENT REPLY EMAIL:
 RESPONSE: Return only the JSON object, no additional text or explanations.""")
     
     try:
-        output = llm(prompt.format_messages(text=reply_text, missing_fields=missing_fields_str)).content.strip()
+        output = await llm_client.ainvoke(
+            prompt.format_messages(text=reply_text, missing_fields=missing_fields_str)
+        )
+        if output is None:
+            # Provider unavailable or circuit open: degrade to rule-based extraction
+            return rule_based_extract(reply_text, fields=missing_fields)
+        
         cleaned = output.replace("```json", "").replace("```", "").strip()
         
         try:
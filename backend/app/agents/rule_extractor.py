@@ -0,0 +1,159 @@
+# backend/app/agents/rule_extractor.py
+import re
+from datetime import datetime
+from typing import Dict, List, Optional
+
+# Degraded-mode extraction used when the LLM circuit is open.
+# It only picks up fields with an unambiguous textual shape; everything
+# else is left as None so the validator asks the client for it.
+
+FIELDS = [
+    "full_name", "email", "phone", "location", "event_name", "event_type",
+    "number_of_attendees", "number_of_sleeping_rooms", "budget",
+    "event_start_date", "event_end_date"
+]
+
+EVENT_TYPES = [
+    "conference", "meeting", "seminar", "training", "workshop", "summit",
+    "offsite", "retreat", "gala", "corporate event", "product launch"
+]
+
+EMAIL_PATTERN = re.compile(r'[\w.+-]+@[\w-]+(?:\.[\w-]+)+')
+PHONE_PATTERN = re.compile(r'\+?\d[\d\s().-]{7,}\d')
+ISO_DATE_PATTERN = re.compile(r'\b(\d{4}-\d{2}-\d{2})\b')
+TEXT_DATE_PATTERN = re.compile(
+    r'\b((?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?\s+\d{1,2}(?:st|nd|rd|th)?,?\s+\d{4}'
+    r'|\d{1,2}(?:st|nd|rd|th)?\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?,?\s+\d{4})',
+    re.IGNORECASE
+)
+ATTENDEES_PATTERN = re.compile(
+    r'(\d[\d,]*)\s*(?:attendees|people|participants|guests|delegates|persons|pax)', re.IGNORECASE
+)
+ROOMS_PATTERN = re.compile(r'(\d[\d,]*)\s*(?:sleeping\s+|hotel\s+|guest\s+)?rooms', re.IGNORECASE)
+BUDGET_PATTERN = re.compile(
+    r'([$€£]\s?\d[\d,]*(?:\.\d+)?\s*[kK]?\b|\d[\d,]*(?:\.\d+)?\s*[kK]?\s*(?:USD|EUR|GBP)\b)'
+)
+EVENT_TYPE_PATTERN = re.compile(
+    r'\b(' + '|'.join(re.escape(event_type) for event_type in EVENT_TYPES) + r')s?\b', re.IGNORECASE
+)
+# "meeting" used as a qualifier rather than the kind of event
+MEETING_QUALIFIER_PATTERN = re.compile(
+    r'\bmeeting\s+(?:rooms?|spaces?|planners?|planning|facilities|packages?)\b', re.IGNORECASE
+)
+DOTTED_DATE_PATTERN = re.compile(r'\b(\d{1,2})[./](\d{1,2})[./](\d{4})\b')
+LOCATION_PATTERN = re.compile(r'\b(?:in|at)\s+([A-Z][a-zA-Z]+(?:,?\s+[A-Z][a-zA-Z]+){0,2})')
+# Only the lead-in is case-insensitive; the name itself must be capitalised words
+NAME_PATTERN = re.compile(
+    r"(?i:my name is|this is|i am|i'm)\s+([A-Z][a-z]+(?:[ \t]+[A-Z][a-z]+)+)\b"
+    r"|(?i:regards|thanks|thank you|best|sincerely|cheers),?[ \t]*\n+[ \t]*([A-Z][a-z]+(?:[ \t]+[A-Z][a-z]+)+)[ \t]*$",
+    re.MULTILINE
+)
+
+# Capitalised words that follow "in"/"at" but are never part of a place name
+NON_PLACE_WORDS = {
+    "tel", "phone", "mobile", "fax", "email", "call", "contact", "regards",
+    "january", "february", "march", "april", "may", "june", "july", "august",
+    "september", "october", "november", "december", "jan", "feb", "mar", "apr",
+    "jun", "jul", "aug", "sep", "sept", "oct", "nov", "dec",
+    "monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday",
+    "spring", "summer", "autumn", "fall", "winter", "q1", "q2", "q3", "q4"
+}
+
+
+def _parse_text_date(value: str) -> Optional[str]:
+    cleaned = re.sub(r'(\d)(st|nd|rd|th)', r'\1', value).replace(",", "").replace(".", "")
+    for fmt in ("%B %d %Y", "%b %d %Y", "%d %B %Y", "%d %b %Y"):
+        try:
+            return datetime.strptime(cleaned, fmt).strftime("%Y-%m-%d")
+        except ValueError:
+            continue
+    return None
+
+
+def _parse_dotted_date(day: str, month: str, year: str) -> Optional[str]:
+    # dd.mm.yyyy / dd/mm/yyyy as written in German and French emails
+    try:
+        return datetime(int(year), int(month), int(day)).strftime("%Y-%m-%d")
+    except ValueError:
+        return None
+
+
+def _clean_location(candidate: str) -> Optional[str]:
+    """Cut a location candidate at the first word that can't belong to a place name"""
+    kept = []
+    for word in candidate.split():
+        if word.strip(",").lower() in NON_PLACE_WORDS:
+            break
+        kept.append(word)
+    return " ".join(kept).strip(",") or None
+
+
+def _single(values: List[str]) -> Optional[str]:
+    """Return the only distinct value, or None if there are none or several"""
+    distinct = list(dict.fromkeys(values))
+    return distinct[0] if len(distinct) == 1 else None
+
+
+def _to_int(value: str) -> Optional[int]:
+    try:
+        return int(value.replace(",", ""))
+    except ValueError:
+        return None
+
+
+def rule_based_extract(text: str, fields: Optional[List[str]] = None) -> Dict:
+    """Extract event fields with regular expressions, limited to `fields` if given"""
+
+    result = {field: None for field in FIELDS}
+
+    match = EMAIL_PATTERN.search(text)
+    if match:
+        result["email"] = match.group(0)
+
+    # Drop dates first so they aren't mistaken for phone numbers
+    without_dates = DOTTED_DATE_PATTERN.sub(" ", ISO_DATE_PATTERN.sub(" ", text))
+    result["phone"] = _single([
+        match.group(0).strip() for match in PHONE_PATTERN.finditer(without_dates)
+        if len(re.sub(r'\D', '', match.group(0))) >= 7
+    ])
+
+    dates = []
+    for position, value in sorted(
+        [(m.start(), m.group(1)) for m in ISO_DATE_PATTERN.finditer(text)]
+        + [(m.start(), _parse_text_date(m.group(1))) for m in TEXT_DATE_PATTERN.finditer(text)]
+        + [(m.start(), _parse_dotted_date(*m.groups())) for m in DOTTED_DATE_PATTERN.finditer(text)]
+    ):
+        if value and value not in dates:
+            dates.append(value)
+    if dates:
+        result["event_start_date"] = dates[0]
+        result["event_end_date"] = dates[1] if len(dates) > 1 else dates[0]
+
+    match = ATTENDEES_PATTERN.search(text)
+    if match:
+        result["number_of_attendees"] = _to_int(match.group(1))
+
+    match = ROOMS_PATTERN.search(text)
+    if match:
+        result["number_of_sleeping_rooms"] = _to_int(match.group(1))
+
+    match = BUDGET_PATTERN.search(text)
+    if match:
+        result["budget"] = match.group(1).strip()
+
+    locations = [_clean_location(match.group(1)) for match in LOCATION_PATTERN.finditer(text)]
+    result["location"] = _single([location for location in locations if location])
+
+    result["full_name"] = _single([
+        match.group(1) or match.group(2) for match in NAME_PATTERN.finditer(text)
+    ])
+
+    without_qualifiers = MEETING_QUALIFIER_PATTERN.sub(" ", text)
+    result["event_type"] = _single([
+        match.group(1).lower() for match in EVENT_TYPE_PATTERN.finditer(without_qualifiers)
+    ])
+
+    if fields is not None:
+        result = {field: result.get(field) for field in fields}
+
+    return result
@@ -1,10 +1,11 @@
 # backend/app/main.py
-from fastapi import FastAPI, HTTPException, UploadFile, File
+from fastapi import FastAPI, HTTPException, UploadFile, File, Header
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, EmailStr
 from typing import List, Optional, Dict, Any
 import uuid
-from datetime import datetime
+from datetime import date, datetime
 
 app = FastAPI(title="AIME Meeting Planner API")
 
@@ -25,7 +26,12 @@ class EmailRequest(BaseModel):
 class ReplyRequest(BaseModel):
     event_id: str
     reply_content: str
-    round_number: int
+    # Ignored: rounds are assigned by the server from the conversation log
+    round_number: Optional[int] = None
+    # Client-side id of the reply email; resends with the same id return the
+    # existing round. Without one, only a repeat of the latest inbound email
+    # counts as a resend
+    message_id: Optional[str] = None
 
 class EventData(BaseModel):
     event_id: Optional[str] = None
@@ -59,8 +65,17 @@ from app.agents.extractor import extractor_agent
 from app.agents.validator import validator_agent
 from app.agents.communicator import communicator_agent
 from app.agents.reply_extractor import reply_extractor_agent
-from app.services.database import save_to_db, get_event_data
+from app.services.database import get_event_data
 from app.services.tts import TextToSpeechService
+from app.services.cache import compute_etag
+from app.services.conversation import (
+    INBOUND_EMAIL, EXTRACTION, FOLLOWUP, ConversationConflict,
+    append_events, get_conversation_state, is_resend, merge_event_data, message_key
+)
+from app.services.export import EXPORT_FORMATS, get_export_watermark, stream_venue_leads
+
+# Attempts at appending a reply before giving up on a contended thread
+MAX_REPLY_ATTEMPTS = 3
 
 @app.get("/health")
 async def health_check():
@@ -90,10 +105,16 @@ async def process_email(request: EmailRequest):
             language=request.language
         )
         
-        # Save to database
-        success = await save_to_db(event_id, extracted_data, round_number=1)
-        if not success:
-            raise HTTPException(status_code=500, detail="Database save failed")
+        # Record the thread in the conversation log and save the venue lead with it
+        await append_events(event_id, 0, [
+            (INBOUND_EMAIL, 1, {
+                "content": request.email_content,
+                "language": request.language,
+                "message_key": message_key(request.email_content)
+            }),
+            (EXTRACTION, 1, {"fields": extracted_data, "missing_fields": missing_fields}),
+            (FOLLOWUP, 1, {"email": followup_email})
+        ], read_model=(extracted_data, 1))
         
         # Check for attachments
         attachments = extract_attachments(request.email_content)
@@ -115,36 +136,72 @@ async def process_email(request: EmailRequest):
 async def process_reply(request: ReplyRequest):
     """Process client reply email"""
     try:
-        # Get existing event data
-        existing_data = await get_event_data(request.event_id)
-        if not existing_data:
-            raise HTTPException(status_code=404, detail="Event not found")
-        
-        # Get current missing fields
-        missing_fields = validator_agent(existing_data)
-        
-        # Extract new information from reply
-        reply_data = await reply_extractor_agent(request.reply_content, missing_fields)
-        
-        # Merge data
-        updated_data = merge_event_data(existing_data, reply_data)
+        reply_data = None
+        reply_key = message_key(request.reply_content, request.message_id)
         
-        # Check what's still missing
-        new_missing_fields = validator_agent(updated_data)
-        
-        # Generate appropriate email
-        new_round = request.round_number + 1
-        followup_email = communicator_agent(
-            new_missing_fields,
-            request.event_id,
-            updated_data,
-            round_number=new_round
-        )
-        
-        # Save updated data
-        success = await save_to_db(request.event_id, updated_data, round_number=new_round)
-        if not success:
-            raise HTTPException(status_code=500, detail="Database save failed")
+        # Optimistic concurrency: if another reply lands between reading the
+        # state and appending, reload and re-merge on top of the newer state
+        for attempt in range(MAX_REPLY_ATTEMPTS):
+            state = await get_conversation_state(request.event_id)
+            if not state:
+                raise HTTPException(status_code=404, detail="Event not found")
+            
+            # A resent reply is answered with the thread as it stands, not a new round
+            if is_resend(state, reply_key):
+                return ProcessingResponse(
+                    event_id=request.event_id,
+                    extracted_data=EventData(**state["fields"]),
+                    missing_fields=state["missing_fields"],
+                    followup_email=state["followup_email"],
+                    is_complete=len(state["missing_fields"]) == 0,
+                    round_number=state["round_number"],
+                    attachments=[]
+                )
+            
+            missing_fields = (
+                validator_agent(state["fields"]) if state.get("legacy") else state["missing_fields"]
+            )
+            
+            # Extract new information from reply (only once across retries)
+            if reply_data is None:
+                reply_data = await reply_extractor_agent(request.reply_content, missing_fields) or {}
+            
+            # Merge data and check what's still missing
+            updated_data = merge_event_data(state["fields"], reply_data)
+            new_missing_fields = validator_agent(updated_data)
+            
+            # Generate appropriate email
+            new_round = state["round_number"] + 1
+            followup_email = communicator_agent(
+                new_missing_fields,
+                request.event_id,
+                updated_data,
+                round_number=new_round,
+                language=state["language"]
+            )
+            
+            events = []
+            if state.get("legacy"):
+                # Import the pre-log venue lead state as the thread's first extraction
+                events.append((EXTRACTION, state["round_number"], {
+                    "fields": state["fields"], "missing_fields": missing_fields
+                }))
+            events += [
+                (INBOUND_EMAIL, new_round, {"content": request.reply_content, "message_key": reply_key}),
+                (EXTRACTION, new_round, {"fields": reply_data, "missing_fields": new_missing_fields}),
+                (FOLLOWUP, new_round, {"email": followup_email})
+            ]
+            
+            try:
+                await append_events(
+                    request.event_id, state["version"], events,
+                    read_model=(updated_data, new_round)
+                )
+                break
+            except ConversationConflict:
+                continue
+        else:
+            raise HTTPException(status_code=409, detail="Event was modified concurrently, please retry")
         
         return ProcessingResponse(
             event_id=request.event_id,
@@ -156,6 +213,8 @@ async def process_reply(request: ReplyRequest):
             attachments=[]
         )
     
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -170,23 +229,71 @@ async def text_to_speech(request: TextToSpeechRequest):
     else:
         raise HTTPException(status_code=500, detail="Failed to generate speech")
 
+@app.post("/api/text-to-speech/stream")
+async def text_to_speech_stream(request: TextToSpeechRequest):
+    """Stream speech as MP3 audio, sentence chunk by sentence chunk"""
+    if not request.text or len(request.text.strip()) < 5:
+        raise HTTPException(status_code=400, detail="Text too short for speech synthesis")
+    
+    tts_service = TextToSpeechService()
+    audio = tts_service.stream_speech(request.text, request.language)
+    
+    # Wait for the first chunk so an immediate failure is a 500 rather than an empty stream;
+    # a later failure can only be signalled by the connection closing early
+    try:
+        first_chunk = await audio.__anext__()
+    except Exception:
+        raise HTTPException(status_code=500, detail="Failed to generate speech")
+    
+    async def audio_stream():
+        yield first_chunk
+        async for chunk in audio:
+            yield chunk
+    
+    return StreamingResponse(audio_stream(), media_type="audio/mpeg")
+
 @app.get("/api/events/{event_id}")
-async def get_event(event_id: str):
-    """Get event details by ID"""
+async def get_event(event_id: str, if_none_match: Optional[str] = Header(None)):
+    """Get event details by ID, answering 304 if the client's ETag is current"""
     event_data = await get_event_data(event_id)
     if not event_data:
         raise HTTPException(status_code=404, detail="Event not found")
-    return event_data
+    
+    etag = compute_etag(event_data)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(content=event_data, headers=headers)
+
+@app.get("/api/exports/venue-leads")
+def export_venue_leads(
+    format: str = "csv",
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    is_complete: Optional[bool] = None,
+    updated_after: Optional[datetime] = None
+):
+    """Stream the current state of each event as CSV, NDJSON or Parquet"""
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported export format: {format}")
+    
+    # Pin the upper bound so the returned watermark covers exactly what was exported
+    watermark = get_export_watermark()
+    chunks = stream_venue_leads(
+        format,
+        date_from=date_from,
+        date_to=date_to,
+        is_complete=is_complete,
+        updated_after=updated_after,
+        updated_until=watermark
+    )
+    
+    headers = {"Content-Disposition": f'attachment; filename="venueleads.{format}"'}
+    if watermark:
+        headers["X-Export-Watermark"] = watermark.isoformat()
+    return StreamingResponse(chunks, media_type=EXPORT_FORMATS[format], headers=headers)
 
 def extract_attachments(email_text: str) -> List[str]:
     """Extract attachment references from email"""
     import re
     return list(set(re.findall(r'[\w,\s-]+\.(pdf|docx|xlsx|pptx|txt|zip)', email_text, re.IGNORECASE)))
-
-def merge_event_data(existing: Dict, new: Dict) -> Dict:
-    """Merge new data with existing data"""
-    merged = existing.copy()
-    for key, value in new.items():
-        if value and str(value).strip().lower() not in ["", "n/a", "none", "null"]:
-            merged[key] = value
-    return merged
@@ -1,5 +1,5 @@
 # backend/app/models/database.py
-from sqlalchemy import Column, String, Integer, Float, DateTime, Boolean, create_engine
+from sqlalchemy import Column, String, Integer, Float, DateTime, Boolean, JSON, create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from datetime import datetime
@@ -28,6 +28,28 @@ class VenueLead(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     is_complete = Column(Boolean, default=False)
 
+class ConversationEvent(Base):
+    """Append-only log of everything that happened in an event's email thread"""
+    __tablename__ = "conversation_events"
+    
+    # (event_id, sequence) is the optimistic concurrency guard: two writers
+    # appending at the same version cannot both commit
+    event_id = Column(String, primary_key=True)
+    sequence = Column(Integer, primary_key=True)
+    kind = Column(String, nullable=False)
+    round_number = Column(Integer, nullable=False)
+    payload = Column(JSON, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+class ConversationSnapshot(Base):
+    """Folded conversation state as of a given log sequence"""
+    __tablename__ = "conversation_snapshots"
+    
+    event_id = Column(String, primary_key=True)
+    sequence = Column(Integer, nullable=False)
+    state = Column(JSON, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
 # Database connection
 DATABASE_URL = os.getenv(
     "DATABASE_URL", 
@@ -0,0 +1,200 @@
+# backend/app/services/cache.py
+"""
+Read-through cache for event lookups.
+
+Two tiers:
+- an in-process LRU with a short TTL, always on;
+- an optional shared Redis tier, enabled by setting REDIS_URL, so several
+  workers share hits and invalidations.
+
+`append_events`, which writes every venue lead row, invalidates both tiers
+after commit. Other workers' local tiers can serve a stale entry for at most
+EVENT_CACHE_LOCAL_TTL seconds.
+
+Invalidation doesn't delete the entry; it leaves a marker holding the round
+that was just committed. A reader that fetched an older row before the commit
+cannot overwrite the marker with it, because writes only succeed when their
+round_number is not below the one already cached.
+
+The shared tier uses the asyncio Redis client with short socket timeouts, so
+a slow or unreachable Redis degrades to a cache miss instead of stalling the
+event loop.
+"""
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+import copy
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+EVENT_CACHE_SIZE = int(os.getenv("EVENT_CACHE_SIZE", "1024"))
+EVENT_CACHE_LOCAL_TTL = float(os.getenv("EVENT_CACHE_LOCAL_TTL", "5"))
+EVENT_CACHE_SHARED_TTL = int(os.getenv("EVENT_CACHE_SHARED_TTL", "300"))
+REDIS_URL = os.getenv("REDIS_URL")
+REDIS_TIMEOUT = float(os.getenv("REDIS_TIMEOUT", "0.2"))
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire after ttl seconds"""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def set_if(self, key: str, value: Any, predicate: Callable[[Optional[Any]], bool]) -> bool:
+        """Store value only if predicate accepts the current live entry (or None)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            current = entry[1] if entry and entry[0] >= time.monotonic() else None
+            if not predicate(current):
+                return False
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+            return True
+
+    def delete(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+# Store ARGV[1] unless the cached entry is from a newer round. With ARGV[4] == "strict"
+# an entry from the same round also wins (used by invalidation).
+STORE_IF_NOT_OLDER = """
+local current = redis.call('GET', KEYS[1])
+if current then
+    local entry = cjson.decode(current)
+    local floor = entry['min_round']
+    if type(floor) ~= 'number' then floor = entry['round_number'] end
+    if type(floor) ~= 'number' then floor = 0 end
+    local round = tonumber(ARGV[2])
+    if round < floor or (ARGV[4] == 'strict' and round == floor) then
+        return 0
+    end
+end
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[3])
+return 1
+"""
+
+
+def _round_floor(entry: Optional[Dict]) -> int:
+    """Lowest round a write must carry to replace this entry"""
+    if not entry:
+        return 0
+    return entry.get("min_round") or entry.get("round_number") or 0
+
+
+class EventCache:
+    """Event state cache with a local LRU tier and an optional shared Redis tier"""
+
+    def __init__(
+        self,
+        local: TTLCache,
+        redis_url: Optional[str] = None,
+        shared_ttl: int = 300,
+        redis_timeout: float = 0.2
+    ):
+        self.local = local
+        self.shared_ttl = shared_ttl
+        self.shared = None
+        if redis_url:
+            try:
+                from redis import asyncio as aioredis
+                self.shared = aioredis.Redis.from_url(
+                    redis_url,
+                    socket_timeout=redis_timeout,
+                    socket_connect_timeout=redis_timeout
+                )
+            except ImportError:
+                logger.warning("REDIS_URL is set but redis is not installed; using local cache only")
+
+    @staticmethod
+    def _key(event_id: str) -> str:
+        return f"aime:event:{event_id}"
+
+    async def get(self, event_id: str) -> Optional[Dict]:
+        key = self._key(event_id)
+        value = self.local.get(key)
+
+        if value is None and self.shared is not None:
+            try:
+                raw = await self.shared.get(key)
+            except Exception as e:
+                logger.warning(f"Shared cache read error: {str(e)}")
+                raw = None
+            if raw:
+                value = json.loads(raw)
+                self.local.set_if(key, value, lambda current: _round_floor(value) >= _round_floor(current))
+
+        # An invalidation marker means the committed round hasn't been cached yet
+        if value is None or "min_round" in value:
+            return None
+
+        # Hand out copies so callers can't mutate the cached entry
+        return copy.deepcopy(value)
+
+    async def _store(self, event_id: str, value: Dict, round_number: int, strict: bool):
+        key = self._key(event_id)
+        if strict:
+            accept = lambda current: round_number > _round_floor(current)
+        else:
+            accept = lambda current: round_number >= _round_floor(current)
+        self.local.set_if(key, copy.deepcopy(value), accept)
+
+        if self.shared is not None:
+            try:
+                await self.shared.eval(
+                    STORE_IF_NOT_OLDER, 1, key,
+                    json.dumps(value, default=str), round_number, self.shared_ttl,
+                    "strict" if strict else "relaxed"
+                )
+            except Exception as e:
+                logger.warning(f"Shared cache write error: {str(e)}")
+
+    async def set(self, event_id: str, data: Dict):
+        """Cache event data unless a newer round is already cached or committed"""
+        await self._store(event_id, data, data.get("round_number") or 0, strict=False)
+
+    async def invalidate(self, event_id: str, round_number: int):
+        """Mark round_number as committed so older reads can no longer be cached"""
+        await self._store(event_id, {"min_round": round_number}, round_number, strict=True)
+
+def compute_etag(data: Dict) -> str:
+    """Strong ETag over the JSON representation of an event"""
+    body = json.dumps(data, sort_keys=True, default=str).encode("utf-8")
+    return f'"{hashlib.sha1(body).hexdigest()}"'
+
+
+event_cache = EventCache(
+    TTLCache(maxsize=EVENT_CACHE_SIZE, ttl=EVENT_CACHE_LOCAL_TTL),
+    redis_url=REDIS_URL,
+    shared_ttl=EVENT_CACHE_SHARED_TTL,
+    redis_timeout=REDIS_TIMEOUT
+)
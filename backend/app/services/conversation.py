@@ -0,0 +1,196 @@
+# backend/app/services/conversation.py
+"""
+Event-sourced conversation state.
+
+Every inbound email, extraction result and outbound follow-up is appended to
+`conversation_events` as one row. State is rebuilt by folding the events on
+top of the latest snapshot; a snapshot is written whenever the unsnapshotted
+tail reaches SNAPSHOT_INTERVAL events, so a read never replays more than that.
+
+Writers pass the version they read to `append_events`; if another writer got
+there first the insert collides on (event_id, sequence) and
+`ConversationConflict` is raised so the caller can reload and retry.
+
+The matching `venueleads` row is written in the same transaction as the
+events, so the log and the read model never disagree about which rounds
+exist. Inbound emails carry a message key: the client's message id, or a
+content hash when there is none. A reply whose message id is already in the
+log is a resend, not a new round. Content hashes are only compared with the
+latest inbound email, since short replies like "Yes" legitimately repeat
+within a thread.
+"""
+from typing import Dict, List, Optional, Tuple
+import hashlib
+from sqlalchemy.exc import IntegrityError
+from app.models.database import SessionLocal, ConversationEvent, ConversationSnapshot
+from app.services.database import build_venue_lead, get_event_data
+from app.services.cache import event_cache
+import logging
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_INTERVAL = 50
+
+INBOUND_EMAIL = "inbound_email"
+EXTRACTION = "extraction"
+FOLLOWUP = "followup"
+
+class ConversationConflict(Exception):
+    """Raised when the log advanced past the version the writer read"""
+
+def merge_event_data(existing: Dict, new: Dict) -> Dict:
+    """Merge new data with existing data"""
+    merged = existing.copy()
+    for key, value in new.items():
+        if value and str(value).strip().lower() not in ["", "n/a", "none", "null"]:
+            merged[key] = value
+    return merged
+
+def message_key(content: str, message_id: Optional[str] = None) -> str:
+    """Identify an inbound email by its client message id, or by its content"""
+    if message_id:
+        return f"id:{message_id}"
+    normalized = " ".join(content.split())
+    return "sha256:" + hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+def is_resend(state: Dict, key: str) -> bool:
+    """Whether an inbound email with this message key was already recorded"""
+    if key.startswith("id:"):
+        return key in state.get("inbound_keys", {})
+    return key == state.get("last_inbound_key")
+
+def empty_state(event_id: str) -> Dict:
+    return {
+        "event_id": event_id,
+        "version": 0,
+        "round_number": 0,
+        "language": "English",
+        "fields": {},
+        "missing_fields": [],
+        "followup_email": None,
+        "inbound_keys": {},
+        "last_inbound_key": None
+    }
+
+def apply_event(state: Dict, kind: str, round_number: int, payload: Dict) -> Dict:
+    """Fold a single log event into the conversation state"""
+    state = dict(state)
+    state["version"] += 1
+    state["round_number"] = round_number
+
+    if kind == INBOUND_EMAIL:
+        if payload.get("language"):
+            state["language"] = payload["language"]
+        key = payload.get("message_key")
+        state["last_inbound_key"] = key
+        if key and key.startswith("id:"):
+            state["inbound_keys"] = {**state.get("inbound_keys", {}), key: round_number}
+    elif kind == EXTRACTION:
+        state["fields"] = merge_event_data(state["fields"], payload.get("fields") or {})
+        state["missing_fields"] = payload.get("missing_fields", [])
+    elif kind == FOLLOWUP:
+        state["followup_email"] = payload.get("email")
+
+    return state
+
+def _load_state(db, event_id: str) -> Tuple[Optional[Dict], Optional[ConversationSnapshot]]:
+    snapshot = db.get(ConversationSnapshot, event_id)
+    state = dict(snapshot.state) if snapshot else empty_state(event_id)
+
+    events = db.query(ConversationEvent).filter(
+        ConversationEvent.event_id == event_id,
+        ConversationEvent.sequence > state["version"]
+    ).order_by(ConversationEvent.sequence).all()
+
+    for event in events:
+        state = apply_event(state, event.kind, event.round_number, event.payload)
+
+    if state["version"] == 0:
+        return None, snapshot
+    return state, snapshot
+
+async def get_conversation_state(event_id: str) -> Optional[Dict]:
+    """Rebuild the current conversation state from the latest snapshot and log tail"""
+    db = SessionLocal()
+    try:
+        state, _ = _load_state(db, event_id)
+    finally:
+        db.close()
+
+    if state is not None:
+        return state
+
+    # Threads started before the log existed only have venue lead rows;
+    # expose them at version 0 so the first append imports them
+    legacy = await get_event_data(event_id)
+    if not legacy:
+        return None
+
+    state = empty_state(event_id)
+    state["round_number"] = legacy.get("round_number") or 1
+    state["fields"] = {
+        key: value for key, value in legacy.items()
+        if key not in ("round_number", "is_complete")
+    }
+    state["legacy"] = True
+    return state
+
+async def append_events(
+    event_id: str,
+    expected_version: int,
+    events: List[Tuple[str, int, Dict]],
+    read_model: Optional[Tuple[Dict, int]] = None
+) -> Dict:
+    """
+    Append (kind, round_number, payload) events after expected_version
+
+    If read_model is given as (fields, round_number), the venue lead row for
+    that round is written in the same transaction. Returns the new state, or
+    raises ConversationConflict if the log has moved on since
+    expected_version was read.
+    """
+    db = SessionLocal()
+    try:
+        state, snapshot = _load_state(db, event_id)
+        state = state or empty_state(event_id)
+        if state["version"] != expected_version:
+            raise ConversationConflict(
+                f"Event {event_id} is at version {state['version']}, expected {expected_version}"
+            )
+
+        for kind, round_number, payload in events:
+            state = apply_event(state, kind, round_number, payload)
+            db.add(ConversationEvent(
+                event_id=event_id,
+                sequence=state["version"],
+                kind=kind,
+                round_number=round_number,
+                payload=payload
+            ))
+
+        snapshot_sequence = snapshot.sequence if snapshot else 0
+        if state["version"] - snapshot_sequence >= SNAPSHOT_INTERVAL:
+            db.merge(ConversationSnapshot(
+                event_id=event_id,
+                sequence=state["version"],
+                state=state
+            ))
+
+        if read_model:
+            fields, round_number = read_model
+            db.add(build_venue_lead(event_id, fields, round_number))
+
+        db.commit()
+
+    except IntegrityError:
+        db.rollback()
+        logger.info(f"Concurrent append on event {event_id} at version {expected_version}")
+        raise ConversationConflict(f"Event {event_id} was modified concurrently")
+
+    finally:
+        db.close()
+
+    if read_model:
+        # Drop the cached view only once the new round is visible to readers
+        await event_cache.invalidate(event_id, read_model[1])
+    return state
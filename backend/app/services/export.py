@@ -0,0 +1,301 @@
+# backend/app/services/export.py
+"""
+Streaming bulk export of venue leads.
+
+Exports the current state (latest round) of each event as CSV, NDJSON or
+Parquet. Rows are read through a server-side cursor and written out in
+batches, so memory stays bounded regardless of table size.
+
+Incremental exports filter on updated_at, which is stamped by the app at
+insert time rather than at commit. A row can therefore commit after an
+export has already moved the watermark past its timestamp, and app hosts
+can disagree about the clock. To avoid skipping such rows, every
+incremental export re-reads EXPORT_LOOKBACK behind the given watermark.
+Rows in that window may be exported twice; consumers should upsert by
+event_id. Within a single export each event appears exactly once.
+
+Usage:
+    python -m app.services.export --format parquet --output leads.parquet \
+        --watermark-file .venueleads_watermark
+"""
+import argparse
+import csv
+import io
+import json
+import logging
+import os
+import sys
+import time
+from datetime import date, datetime, timedelta
+from typing import Iterator, List, Optional
+
+from sqlalchemy import and_, func
+
+from app.models.database import SessionLocal, VenueLead
+
+logger = logging.getLogger(__name__)
+
+EXPORT_COLUMNS = [
+    "event_id", "round_number", "full_name", "email", "phone", "location",
+    "event_name", "event_type", "number_of_attendees", "number_of_sleeping_rooms",
+    "budget", "event_start_date", "event_end_date", "is_complete",
+    "created_at", "updated_at"
+]
+
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet"
+}
+
+# Rows fetched per server-side cursor round trip and written per output chunk
+BATCH_SIZE = 5000
+
+# How far behind the watermark incremental exports re-read. It must exceed
+# the longest write transaction plus clock skew between app hosts.
+EXPORT_LOOKBACK = timedelta(seconds=int(os.getenv("EXPORT_LOOKBACK_SECONDS", "600")))
+
+
+def get_export_watermark() -> Optional[datetime]:
+    """Return the highest updated_at currently in the table"""
+    db = SessionLocal()
+    try:
+        return db.query(func.max(VenueLead.updated_at)).scalar()
+    finally:
+        db.close()
+
+
+def _latest_rounds_query(
+    db,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    is_complete: Optional[bool] = None,
+    updated_after: Optional[datetime] = None,
+    updated_until: Optional[datetime] = None
+):
+    """Build a query selecting the latest round of every event with filters applied"""
+    latest = db.query(
+        VenueLead.event_id.label("event_id"),
+        func.max(VenueLead.round_number).label("round_number")
+    ).group_by(VenueLead.event_id).subquery()
+
+    query = db.query(*[getattr(VenueLead, column) for column in EXPORT_COLUMNS]).join(
+        latest,
+        and_(
+            VenueLead.event_id == latest.c.event_id,
+            VenueLead.round_number == latest.c.round_number
+        )
+    )
+
+    if date_from:
+        query = query.filter(VenueLead.event_start_date >= date_from)
+    if date_to:
+        # event_start_date is a timestamp; include the whole of date_to
+        query = query.filter(VenueLead.event_start_date < date_to + timedelta(days=1))
+    if is_complete is not None:
+        query = query.filter(VenueLead.is_complete.is_(is_complete))
+    if updated_after:
+        query = query.filter(VenueLead.updated_at > updated_after - EXPORT_LOOKBACK)
+    if updated_until:
+        query = query.filter(VenueLead.updated_at <= updated_until)
+
+    # Stable ordering lets a consumer resume from the last updated_at it saw
+    return query.order_by(VenueLead.updated_at, VenueLead.event_id)
+
+
+def iter_venue_lead_batches(**filters) -> Iterator[List[tuple]]:
+    """Yield lists of at most BATCH_SIZE rows using a server-side cursor"""
+    db = SessionLocal()
+    try:
+        rows = _latest_rounds_query(db, **filters).yield_per(BATCH_SIZE)
+        batch = []
+        for row in rows:
+            batch.append(tuple(row))
+            if len(batch) >= BATCH_SIZE:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+    finally:
+        db.close()
+
+
+def _serialize_value(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _iter_csv(batches: Iterator[List[tuple]]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    for batch in batches:
+        writer.writerows([[_serialize_value(value) for value in row] for row in batch])
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate(0)
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def _iter_ndjson(batches: Iterator[List[tuple]]) -> Iterator[bytes]:
+    for batch in batches:
+        lines = [
+            json.dumps({column: _serialize_value(value) for column, value in zip(EXPORT_COLUMNS, row)})
+            for row in batch
+        ]
+        yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object that hands back what has been written since the last drain"""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        # Parquet records absolute offsets in its footer, so this must never reset
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _iter_parquet(batches: Iterator[List[tuple]]) -> Iterator[bytes]:
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Parquet export requires pyarrow to be installed")
+
+    schema = pa.schema([
+        ("event_id", pa.string()),
+        ("round_number", pa.int64()),
+        ("full_name", pa.string()),
+        ("email", pa.string()),
+        ("phone", pa.string()),
+        ("location", pa.string()),
+        ("event_name", pa.string()),
+        ("event_type", pa.string()),
+        ("number_of_attendees", pa.int64()),
+        ("number_of_sleeping_rooms", pa.int64()),
+        ("budget", pa.float64()),
+        ("event_start_date", pa.timestamp("us")),
+        ("event_end_date", pa.timestamp("us")),
+        ("is_complete", pa.bool_()),
+        ("created_at", pa.timestamp("us")),
+        ("updated_at", pa.timestamp("us"))
+    ])
+
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema)
+    try:
+        for batch in batches:
+            # One row group per batch keeps only a single batch in memory
+            columns = list(zip(*batch))
+            writer.write_table(pa.Table.from_arrays(
+                [pa.array(column, type=field.type) for column, field in zip(columns, schema)],
+                schema=schema
+            ))
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def stream_venue_leads(export_format: str = "csv", **filters) -> Iterator[bytes]:
+    """Stream the current state of every matching event in the given format"""
+    writers = {
+        "csv": _iter_csv,
+        "ndjson": _iter_ndjson,
+        "parquet": _iter_parquet
+    }
+    if export_format not in writers:
+        raise ValueError(f"Unsupported export format: {export_format}")
+    return writers[export_format](iter_venue_lead_batches(**filters))
+
+
+def _parse_date(value: str) -> date:
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Export venue leads")
+    parser.add_argument("--format", choices=sorted(EXPORT_FORMATS), default="csv")
+    parser.add_argument("--output", help="Output file (defaults to stdout)")
+    parser.add_argument("--date-from", type=_parse_date, help="Earliest event start date (YYYY-MM-DD)")
+    parser.add_argument("--date-to", type=_parse_date, help="Latest event start date (YYYY-MM-DD)")
+    completeness = parser.add_mutually_exclusive_group()
+    completeness.add_argument("--complete", dest="is_complete", action="store_true", default=None)
+    completeness.add_argument("--incomplete", dest="is_complete", action="store_false")
+    parser.set_defaults(is_complete=None)
+    parser.add_argument("--updated-after", type=datetime.fromisoformat, help="Only rows updated after this timestamp")
+    parser.add_argument(
+        "--watermark-file",
+        help="File holding the last exported updated_at; read before and advanced after a successful export"
+    )
+    args = parser.parse_args(argv)
+
+    updated_after = args.updated_after
+    if args.watermark_file and updated_after is None:
+        try:
+            with open(args.watermark_file) as watermark_file:
+                content = watermark_file.read().strip()
+                updated_after = datetime.fromisoformat(content) if content else None
+        except FileNotFoundError:
+            pass
+
+    # Pin the upper bound so rows written during the export land in the next run
+    watermark = get_export_watermark()
+
+    chunks = stream_venue_leads(
+        args.format,
+        date_from=args.date_from,
+        date_to=args.date_to,
+        is_complete=args.is_complete,
+        updated_after=updated_after,
+        updated_until=watermark
+    )
+
+    started = time.perf_counter()
+    total_bytes = 0
+    output = open(args.output, "wb") if args.output else sys.stdout.buffer
+    try:
+        for chunk in chunks:
+            output.write(chunk)
+            total_bytes += len(chunk)
+    finally:
+        if args.output:
+            output.close()
+    elapsed = time.perf_counter() - started
+
+    if args.watermark_file and watermark:
+        with open(args.watermark_file, "w") as watermark_file:
+            watermark_file.write(watermark.isoformat())
+
+    print(
+        f"Exported {total_bytes / 1_000_000:.1f} MB as {args.format} in {elapsed:.2f}s "
+        f"(watermark: {watermark.isoformat() if watermark else 'none'})",
+        file=sys.stderr
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,216 @@
+# backend/app/services/llm.py
+"""
+Resilient LLM client shared by the extraction agents.
+
+Wraps the Groq chat models with:
+- a circuit breaker that opens on a high failure rate or slow calls, so
+  requests fail fast during a provider incident instead of waiting for the
+  full timeout;
+- hedged requests that fire the same prompt at a smaller, faster model when
+  the primary has not answered within its recent p95 latency.
+
+When the circuit is open or both models fail, `ainvoke` returns None and the
+agents degrade to rule-based extraction.
+"""
+from langchain_groq import ChatGroq
+from collections import deque
+from typing import Deque, List, Optional, Tuple
+import asyncio
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+PRIMARY_MODEL = os.getenv("GROQ_PRIMARY_MODEL", "llama-3.3-70b-versatile")
+SECONDARY_MODEL = os.getenv("GROQ_SECONDARY_MODEL", "llama-3.1-8b-instant")
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "20"))
+
+
+class CircuitBreaker:
+    """Sliding-window circuit breaker based on failure rate and call latency"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        window_size: int = 20,
+        min_calls: int = 5,
+        failure_rate_threshold: float = 0.5,
+        slow_call_threshold: float = 10.0,
+        open_duration: float = 30.0
+    ):
+        self.window_size = window_size
+        self.min_calls = min_calls
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_threshold = slow_call_threshold
+        self.open_duration = open_duration
+        self.state = self.CLOSED
+        self._outcomes: Deque[bool] = deque(maxlen=window_size)
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    def allow_request(self) -> bool:
+        """Return whether a call may go to the provider right now"""
+        if self.state == self.OPEN:
+            if time.monotonic() - self._opened_at < self.open_duration:
+                return False
+            self.state = self.HALF_OPEN
+            self._probe_in_flight = False
+
+        if self.state == self.HALF_OPEN:
+            # Let exactly one probe through to test whether the provider recovered
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+
+        return True
+
+    def record_success(self, latency: float):
+        # Calls that succeed but exceed the latency threshold still count against the provider
+        if latency > self.slow_call_threshold:
+            self._record(False)
+        else:
+            self._record(True)
+
+    def record_failure(self):
+        self._record(False)
+
+    def record_cancelled(self):
+        # A cancelled call says nothing about the provider, but a cancelled
+        # half-open probe must still give up its slot or the breaker never recovers
+        if self.state == self.HALF_OPEN:
+            self._record(False)
+
+    def _record(self, success: bool):
+        if self.state == self.HALF_OPEN:
+            if success:
+                self.state = self.CLOSED
+                self._outcomes.clear()
+            else:
+                self._open()
+            self._probe_in_flight = False
+            return
+
+        self._outcomes.append(success)
+        if len(self._outcomes) < self.min_calls:
+            return
+
+        failure_rate = self._outcomes.count(False) / len(self._outcomes)
+        if failure_rate >= self.failure_rate_threshold:
+            self._open()
+
+    def _open(self):
+        logger.warning("LLM circuit breaker opened")
+        self.state = self.OPEN
+        self._opened_at = time.monotonic()
+        self._outcomes.clear()
+
+
+class ResilientLLM:
+    """Primary/secondary chat model pair with hedging behind a circuit breaker"""
+
+    def __init__(
+        self,
+        primary,
+        secondary=None,
+        breaker: Optional[CircuitBreaker] = None,
+        timeout: float = LLM_TIMEOUT,
+        default_hedge_delay: float = 3.0,
+        min_hedge_delay: float = 0.5,
+        latency_samples: int = 100
+    ):
+        self.primary = primary
+        self.secondary = secondary
+        self.breaker = breaker or CircuitBreaker()
+        self.timeout = timeout
+        self.default_hedge_delay = default_hedge_delay
+        self.min_hedge_delay = min_hedge_delay
+        self._latencies: Deque[float] = deque(maxlen=latency_samples)
+
+    def hedge_delay(self) -> float:
+        """Delay before hedging: the primary's recent p95 latency"""
+        if len(self._latencies) < 20:
+            return self.default_hedge_delay
+        ordered = sorted(self._latencies)
+        p95 = ordered[int(len(ordered) * 0.95) - 1]
+        return max(self.min_hedge_delay, min(p95, self.timeout))
+
+    async def _call(self, model, messages: List) -> Tuple[str, float]:
+        started = time.monotonic()
+        response = await model.ainvoke(messages)
+        return response.content.strip(), time.monotonic() - started
+
+    async def ainvoke(self, messages: List) -> Optional[str]:
+        """Return the model output, or None if the circuit is open or every attempt failed"""
+        if not self.breaker.allow_request():
+            logger.info("LLM circuit open, skipping provider call")
+            return None
+
+        started = time.monotonic()
+        delay = min(self.hedge_delay(), self.timeout)
+        primary_task = asyncio.create_task(self._call(self.primary, messages))
+        tasks = {primary_task}
+        result = None
+
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            primary_failed = bool(done) and primary_task.exception() is not None
+            if (not done or primary_failed) and self.secondary is not None:
+                tasks.add(asyncio.create_task(self._call(self.secondary, messages)))
+
+            pending = set(tasks)
+            while pending and result is None:
+                remaining = self.timeout - (time.monotonic() - started)
+                if remaining <= 0:
+                    break
+                done, pending = await asyncio.wait(
+                    pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is not None:
+                        logger.warning(f"LLM call failed: {task.exception()}")
+                        continue
+                    result, latency = task.result()
+                    if task is primary_task:
+                        self._latencies.append(latency)
+                    break
+        except asyncio.CancelledError:
+            self.breaker.record_cancelled()
+            raise
+        except Exception:
+            self.breaker.record_failure()
+            raise
+        finally:
+            if not primary_task.done():
+                # The primary lost to the hedge or timed out. Dropping it would bias
+                # the p95 low, but its elapsed time includes the hedge's own latency
+                # and would ratchet the delay upwards while the primary hangs, so
+                # sample the delay that was in force instead
+                self._latencies.append(delay)
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+        if result is None:
+            self.breaker.record_failure()
+            return None
+
+        self.breaker.record_success(time.monotonic() - started)
+        return result
+
+
+llm_client = ResilientLLM(
+    primary=ChatGroq(
+        api_key=os.getenv("GROQ_API_KEY"),
+        model_name=PRIMARY_MODEL,
+        temperature=0.2
+    ),
+    secondary=ChatGroq(
+        api_key=os.getenv("GROQ_API_KEY"),
+        model_name=SECONDARY_MODEL,
+        temperature=0.2
+    )
+)
@@ -1,69 +1,128 @@
 # backend/app/services/tts.py
 import edge_tts
 import base64
-import tempfile
-import os
 import asyncio
-from typing import Optional
+import logging
+import re
+from typing import AsyncIterator, List, Optional
 from app.core.languages import LANGUAGE_CONFIG
 
+logger = logging.getLogger(__name__)
+
+# Upper bound on simultaneous edge-tts connections per request
+MAX_CONCURRENT_SYNTHESIS = 4
+
+# Sentences are packed into chunks of at most this many characters
+MAX_CHUNK_CHARS = 300
+
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?…])\s+')
+
 class TextToSpeechService:
     """Service for handling text-to-speech conversion"""
-    
-    def __init__(self):
-        self.voice_mapping = {
-            "English": "en-US-AriaNeural",
-            "Spanish": "es-ES-ElviraNeural",
-            "German": "de-DE-KatjaNeural",
-            "French": "fr-FR-DeniseNeural"
-        }
-    
+
+    def __init__(self, max_concurrency: int = MAX_CONCURRENT_SYNTHESIS):
+        self.max_concurrency = max_concurrency
+
+    @staticmethod
+    def get_voice(language: str) -> str:
+        """Return the neural voice configured for a language"""
+        return LANGUAGE_CONFIG.get(language, LANGUAGE_CONFIG["English"])["voice"]
+
+    @staticmethod
+    def split_into_chunks(text: str, max_chars: int = MAX_CHUNK_CHARS) -> List[str]:
+        """Split text into sentence-aligned chunks of at most max_chars characters"""
+        pieces = []
+        for line in text.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            # Give unpunctuated lines (headings, sign-offs) a spoken pause
+            if line[-1] not in '.!?…:;,':
+                line += '.'
+            pieces.extend(SENTENCE_BOUNDARY.split(line))
+
+        sentences = []
+        for sentence in pieces:
+            sentence = sentence.strip()
+            # Break overly long sentences on word boundaries
+            while len(sentence) > max_chars:
+                cut = sentence.rfind(' ', 0, max_chars)
+                if cut <= 0:
+                    cut = max_chars
+                sentences.append(sentence[:cut].strip())
+                sentence = sentence[cut:].strip()
+            if sentence:
+                sentences.append(sentence)
+
+        # Keep the first sentence on its own so the first audio arrives quickly,
+        # then pack the rest to cut down on round trips
+        chunks = sentences[:1]
+        for sentence in sentences[1:]:
+            if len(chunks) > 1 and len(chunks[-1]) + len(sentence) + 1 <= max_chars:
+                chunks[-1] = f"{chunks[-1]} {sentence}"
+            else:
+                chunks.append(sentence)
+
+        return chunks
+
+    async def _synthesize(self, text: str, voice: str, semaphore: asyncio.Semaphore) -> bytes:
+        async with semaphore:
+            audio = bytearray()
+            communicate = edge_tts.Communicate(text, voice)
+            async for message in communicate.stream():
+                if message["type"] == "audio":
+                    audio.extend(message["data"])
+            return bytes(audio)
+
+    async def stream_speech(self, text: str, language: str = "English") -> AsyncIterator[bytes]:
+        """
+        Synthesize text chunk by chunk and yield MP3 audio in order
+
+        Chunks are synthesized concurrently (bounded by max_concurrency); each one
+        is yielded as soon as it and all earlier chunks are ready.
+        """
+        voice = self.get_voice(language)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        tasks = [
+            asyncio.create_task(self._synthesize(chunk, voice, semaphore))
+            for chunk in self.split_into_chunks(text)
+        ]
+
+        try:
+            for index, task in enumerate(tasks):
+                try:
+                    audio = await task
+                except Exception as e:
+                    logger.error(f"TTS chunk {index + 1}/{len(tasks)} failed: {str(e)}")
+                    raise
+                yield audio
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            # Collect every outcome so failed later chunks don't surface as
+            # "Task exception was never retrieved"
+            await asyncio.gather(*tasks, return_exceptions=True)
+
     async def generate_speech(self, text: str, language: str = "English") -> Optional[str]:
         """
         Generate speech from text and return base64 encoded audio
-        
+
         Args:
             text: The text to convert to speech
             language: The language for speech synthesis
-            
+
         Returns:
             Base64 encoded audio string or None if failed
         """
         if not text or len(text.strip()) < 5:
             return None
-        
+
         try:
-            # Clean and prepare text
-            clean_text = text.replace('\n\n', '. ').replace('\n', ' ').strip()
-            
-            # Limit length for better performance
-            if len(clean_text) > 600:
-                clean_text = clean_text[:600] + "..."
-            
-            # Get the appropriate voice
-            voice = self.voice_mapping.get(language, "en-US-AriaNeural")
-            
-            # Create temporary file
-            with tempfile.NamedTemporaryFile(suffix='.mp3', delete=False) as tmp_file:
-                temp_path = tmp_file.name
-            
-            # Generate speech
-            communicate = edge_tts.Communicate(clean_text, voice)
-            await communicate.save(temp_path)
-            
-            # Read the file and encode to base64
-            with open(temp_path, 'rb') as audio_file:
-                audio_data = audio_file.read()
-                audio_base64 = base64.b64encode(audio_data).decode('utf-8')
-            
-            # Cleanup
-            try:
-                os.unlink(temp_path)
-            except:
-                pass
-            
-            return audio_base64
-            
+            # MP3 frames can be concatenated directly
+            audio_data = b"".join([chunk async for chunk in self.stream_speech(text, language)])
+            return base64.b64encode(audio_data).decode('utf-8')
+
         except Exception as e:
-            print(f"TTS Error: {str(e)}")
-            return None
\ No newline at end of file
+            logger.error(f"TTS Error: {str(e)}")
+            return None
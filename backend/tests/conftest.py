@@ -0,0 +1,87 @@
+# backend/tests/conftest.py
+import json
+import os
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+# The production client is built at import time and needs a key to construct
+os.environ.setdefault("GROQ_API_KEY", "test-key")
+
+# Never point the suite at a real database; models create their tables on import
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/test.db"
+
+
+class MockProvider:
+    """Local OpenAI-compatible chat completions server with per-model fault injection"""
+
+    def __init__(self):
+        self.behaviour = {}
+        self.requests = {}
+        self._lock = threading.Lock()
+        provider = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                model = body["model"]
+                with provider._lock:
+                    provider.requests[model] = provider.requests.get(model, 0) + 1
+                delay, status, content = provider.behaviour.get(model, (0.0, 200, '{"ok": true}'))
+                time.sleep(delay)
+
+                if status == 200:
+                    payload = {
+                        "id": "chatcmpl-test",
+                        "object": "chat.completion",
+                        "created": int(time.time()),
+                        "model": model,
+                        "choices": [{
+                            "index": 0,
+                            "message": {"role": "assistant", "content": content},
+                            "finish_reason": "stop"
+                        }],
+                        "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2}
+                    }
+                else:
+                    payload = {"error": {"message": "injected failure", "type": "server_error"}}
+
+                data = json.dumps(payload).encode("utf-8")
+                try:
+                    self.send_response(status)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client gave up on a hedged or timed-out call
+                    pass
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}"
+
+    def set(self, model: str, delay: float = 0.0, status: int = 200, content: str = '{"ok": true}'):
+        self.behaviour[model] = (delay, status, content)
+
+    def count(self, model: str) -> int:
+        return self.requests.get(model, 0)
+
+    def model(self, name: str):
+        from langchain_groq import ChatGroq
+        return ChatGroq(api_key="test-key", model_name=name, base_url=self.base_url, max_retries=0)
+
+
+@pytest.fixture
+def provider():
+    mock = MockProvider()
+    thread = threading.Thread(target=mock.server.serve_forever, daemon=True)
+    thread.start()
+    yield mock
+    mock.server.shutdown()
+    mock.server.server_close()
@@ -0,0 +1,95 @@
+# backend/tests/test_cache.py
+import asyncio
+import time
+
+from app.services.cache import EventCache, TTLCache, compute_etag
+
+EVENT = {"event_id": "REQ-1", "round_number": 1, "email": "jane@acme.com"}
+
+
+def local_cache():
+    return EventCache(TTLCache(maxsize=2, ttl=60))
+
+
+def test_local_tier_round_trip_returns_copies():
+    cache = local_cache()
+
+    async def run():
+        await cache.set("REQ-1", EVENT)
+        first = await cache.get("REQ-1")
+        first["email"] = "changed"
+        return await cache.get("REQ-1")
+
+    assert asyncio.run(run()) == EVENT
+
+
+def test_local_tier_expires_and_evicts():
+    ttl = TTLCache(maxsize=2, ttl=0.05)
+    ttl.set("a", 1)
+    ttl.set("b", 2)
+    ttl.get("a")
+    ttl.set("c", 3)
+
+    assert ttl.get("b") is None
+    assert ttl.get("a") == 1
+
+    time.sleep(0.06)
+    assert ttl.get("a") is None
+
+
+def test_etag_changes_with_content():
+    assert compute_etag(EVENT) == compute_etag(dict(EVENT))
+    assert compute_etag(EVENT) != compute_etag({**EVENT, "round_number": 2})
+
+
+def test_unresponsive_redis_degrades_to_miss_quickly():
+    async def run():
+        # Accepts connections but never answers
+        server = await asyncio.start_server(lambda reader, writer: None, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        cache = EventCache(
+            TTLCache(maxsize=10, ttl=60), redis_url=f"redis://127.0.0.1:{port}/0", redis_timeout=0.1
+        )
+        async with server:
+            started = time.monotonic()
+            await cache.set("REQ-1", EVENT)
+            cache.local.delete(cache._key("REQ-1"))
+            value = await cache.get("REQ-1")
+            await cache.invalidate("REQ-1", 2)
+            return value, time.monotonic() - started
+
+    value, elapsed = asyncio.run(run())
+
+    assert value is None
+    assert elapsed < 1.0
+
+
+def test_stale_read_cannot_overwrite_invalidation():
+    cache = local_cache()
+
+    async def run():
+        # Reader fetched round 1, then round 2 was committed and invalidated
+        await cache.invalidate("REQ-1", 2)
+        await cache.set("REQ-1", EVENT)
+        stale = await cache.get("REQ-1")
+
+        await cache.set("REQ-1", {**EVENT, "round_number": 2})
+        fresh = await cache.get("REQ-1")
+        return stale, fresh
+
+    stale, fresh = asyncio.run(run())
+
+    assert stale is None
+    assert fresh["round_number"] == 2
+
+
+def test_invalidation_keeps_newer_cached_round():
+    cache = local_cache()
+
+    async def run():
+        await cache.set("REQ-1", {**EVENT, "round_number": 3})
+        await cache.invalidate("REQ-1", 2)
+        await cache.invalidate("REQ-1", 3)
+        return await cache.get("REQ-1")
+
+    assert asyncio.run(run())["round_number"] == 3
@@ -0,0 +1,154 @@
+# backend/tests/test_conversation.py
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import main
+from app.models.database import ConversationEvent, ConversationSnapshot, SessionLocal, VenueLead
+from app.services import conversation
+
+INITIAL = {"full_name": "Jane Doe", "email": "jane@acme.com", "event_type": "conference"}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    calls = []
+
+    async def fake_extractor(email_text):
+        return dict(INITIAL)
+
+    async def fake_reply_extractor(reply_text, missing_fields):
+        calls.append(reply_text)
+        return {"phone": reply_text.split()[-1]}
+
+    monkeypatch.setattr(main, "extractor_agent", fake_extractor)
+    monkeypatch.setattr(main, "reply_extractor_agent", fake_reply_extractor)
+    test_client = TestClient(main.app)
+    test_client.reply_calls = calls
+    return test_client
+
+
+def start_thread(client):
+    response = client.post("/api/process-email", json={"email_content": "We need a venue"})
+    assert response.status_code == 200
+    return response.json()["event_id"]
+
+
+def reply(client, event_id, content, **extra):
+    return client.post("/api/process-reply", json={"event_id": event_id, "reply_content": content, **extra})
+
+
+def venue_lead_rounds(event_id):
+    db = SessionLocal()
+    try:
+        return sorted(row.round_number for row in db.query(VenueLead).filter(VenueLead.event_id == event_id))
+    finally:
+        db.close()
+
+
+def event_count(event_id):
+    db = SessionLocal()
+    try:
+        return db.query(ConversationEvent).filter(ConversationEvent.event_id == event_id).count()
+    finally:
+        db.close()
+
+
+def test_rounds_are_assigned_by_the_server(client):
+    event_id = start_thread(client)
+
+    response = reply(client, event_id, "Call me on 555-0100", round_number=7)
+
+    assert response.status_code == 200
+    assert response.json()["round_number"] == 2
+    assert response.json()["extracted_data"]["phone"] == "555-0100"
+    assert venue_lead_rounds(event_id) == [1, 2]
+
+
+def test_resent_reply_returns_existing_round(client):
+    event_id = start_thread(client)
+    first = reply(client, event_id, "Call me on 555-0100")
+    events = event_count(event_id)
+
+    resent = reply(client, event_id, "Call me on   555-0100")
+
+    assert resent.status_code == 200
+    assert resent.json() == first.json()
+    assert client.reply_calls == ["Call me on 555-0100"]
+    assert event_count(event_id) == events
+    assert venue_lead_rounds(event_id) == [1, 2]
+
+
+def test_message_id_distinguishes_identical_replies(client):
+    event_id = start_thread(client)
+
+    reply(client, event_id, "Yes", message_id="a")
+    response = reply(client, event_id, "Yes", message_id="b")
+    resent = reply(client, event_id, "Yes", message_id="b")
+
+    assert response.json()["round_number"] == 3
+    assert resent.json()["round_number"] == 3
+
+
+def test_repeated_text_is_a_new_reply_once_the_thread_moved_on(client):
+    event_id = start_thread(client)
+
+    reply(client, event_id, "Confirmed 555-0100")
+    reply(client, event_id, "Corrected 555-0199")
+    response = reply(client, event_id, "Confirmed 555-0100")
+
+    assert response.json()["round_number"] == 4
+    assert response.json()["extracted_data"]["phone"] == "555-0100"
+    assert len(client.reply_calls) == 3
+
+
+def test_failed_read_model_write_rolls_back_the_round(client, monkeypatch):
+    event_id = start_thread(client)
+    build_venue_lead = conversation.build_venue_lead
+
+    def failing_build(*args, **kwargs):
+        raise RuntimeError("venueleads unavailable")
+
+    monkeypatch.setattr(conversation, "build_venue_lead", failing_build)
+    assert reply(client, event_id, "Call me on 555-0100").status_code == 500
+    assert event_count(event_id) == 3
+
+    monkeypatch.setattr(conversation, "build_venue_lead", build_venue_lead)
+    response = reply(client, event_id, "Call me on 555-0100")
+
+    assert response.json()["round_number"] == 2
+    assert venue_lead_rounds(event_id) == [1, 2]
+
+
+def test_stale_version_append_conflicts(client):
+    event_id = start_thread(client)
+
+    async def run():
+        state = await conversation.get_conversation_state(event_id)
+        events = [(conversation.INBOUND_EMAIL, 2, {"content": "x"})]
+        await conversation.append_events(event_id, state["version"], events)
+        await conversation.append_events(event_id, state["version"], events)
+
+    with pytest.raises(conversation.ConversationConflict):
+        asyncio.run(run())
+
+
+def test_snapshots_bound_replay(client, monkeypatch):
+    monkeypatch.setattr(conversation, "SNAPSHOT_INTERVAL", 5)
+    event_id = start_thread(client)
+
+    for index in range(6):
+        reply(client, event_id, f"Call me on 555-010{index}")
+
+    db = SessionLocal()
+    try:
+        snapshot = db.get(ConversationSnapshot, event_id)
+        total = event_count(event_id)
+    finally:
+        db.close()
+
+    state = asyncio.run(conversation.get_conversation_state(event_id))
+    assert state["round_number"] == 7
+    assert state["fields"]["phone"] == "555-0105"
+    assert total - snapshot.sequence < 5
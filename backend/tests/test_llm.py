@@ -0,0 +1,187 @@
+# backend/tests/test_llm.py
+import asyncio
+import time
+
+from langchain.schema import HumanMessage
+
+from app.services.llm import CircuitBreaker, ResilientLLM
+
+MESSAGES = [HumanMessage(content="Extract the event details")]
+
+
+def timed(coroutine):
+    started = time.monotonic()
+    result = asyncio.run(coroutine)
+    return result, time.monotonic() - started
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def test_healthy_primary_answers_without_hedging(provider):
+    provider.set("primary", delay=0.05, content="primary")
+    client = ResilientLLM(provider.model("primary"), provider.model("secondary"), timeout=2)
+
+    result, elapsed = timed(client.ainvoke(MESSAGES))
+
+    assert result == "primary"
+    assert elapsed < 1.0
+    assert provider.count("secondary") == 0
+
+
+def test_failing_primary_hedges_immediately(provider):
+    provider.set("primary", status=503)
+    provider.set("secondary", delay=0.05, content="secondary")
+    client = ResilientLLM(provider.model("primary"), provider.model("secondary"), timeout=5)
+
+    result, elapsed = timed(client.ainvoke(MESSAGES))
+
+    assert result == "secondary"
+    # No waiting out the hedge delay, let alone the timeout
+    assert elapsed < 1.0
+
+
+def test_hung_primary_tail_latency_bounded_by_hedge(provider):
+    provider.set("primary", delay=3.0)
+    provider.set("secondary", delay=0.05, content="secondary")
+    client = ResilientLLM(
+        provider.model("primary"), provider.model("secondary"),
+        breaker=CircuitBreaker(min_calls=100), timeout=5, default_hedge_delay=0.2
+    )
+
+    async def run():
+        latencies = []
+        for _ in range(10):
+            started = time.monotonic()
+            assert await client.ainvoke(MESSAGES) == "secondary"
+            latencies.append(time.monotonic() - started)
+        return latencies
+
+    latencies = asyncio.run(run())
+
+    # Every request is answered by the hedge, far below the 5s timeout
+    assert percentile(latencies, 0.99) < 1.0
+
+
+def test_hung_primary_does_not_ratchet_hedge_delay(provider):
+    provider.set("primary", delay=3.0)
+    provider.set("secondary", delay=0.02, content="secondary")
+    breaker = CircuitBreaker(slow_call_threshold=0.5)
+    client = ResilientLLM(
+        provider.model("primary"), provider.model("secondary"),
+        breaker=breaker, timeout=5, default_hedge_delay=0.05, min_hedge_delay=0.01
+    )
+
+    async def run():
+        for _ in range(40):
+            assert await client.ainvoke(MESSAGES) == "secondary"
+
+    asyncio.run(run())
+
+    # Past the 20-sample minimum the delay comes from the p95 and must not climb
+    assert len(client._latencies) == 40
+    assert client.hedge_delay() <= 0.05
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_hedge_fires_after_p95_delay(provider):
+    provider.set("primary", delay=2.0)
+    provider.set("secondary", delay=0.05, content="secondary")
+    client = ResilientLLM(
+        provider.model("primary"), provider.model("secondary"),
+        timeout=5, default_hedge_delay=3.0, min_hedge_delay=0.1
+    )
+    client._latencies.extend([0.1] * 19 + [0.3] * 1)
+
+    assert client.hedge_delay() == 0.1
+
+    result, elapsed = timed(client.ainvoke(MESSAGES))
+
+    assert result == "secondary"
+    assert 0.1 <= elapsed < 1.0
+    assert provider.count("secondary") == 1
+
+
+def test_primary_losing_to_hedge_is_still_sampled(provider):
+    provider.set("primary", delay=2.0)
+    provider.set("secondary", delay=0.2, content="secondary")
+    client = ResilientLLM(
+        provider.model("primary"), provider.model("secondary"), timeout=5, default_hedge_delay=0.1
+    )
+
+    timed(client.ainvoke(MESSAGES))
+
+    # Sampled at the delay in force, not the elapsed time including the hedge
+    assert list(client._latencies) == [0.1]
+
+
+def test_breaker_opens_and_fails_fast(provider):
+    provider.set("primary", status=503)
+    breaker = CircuitBreaker(min_calls=3, open_duration=60)
+    client = ResilientLLM(provider.model("primary"), breaker=breaker, timeout=2)
+
+    for _ in range(3):
+        assert asyncio.run(client.ainvoke(MESSAGES)) is None
+    assert breaker.state == CircuitBreaker.OPEN
+
+    result, elapsed = timed(client.ainvoke(MESSAGES))
+
+    assert result is None
+    assert elapsed < 0.05
+    assert provider.count("primary") == 3
+
+
+def test_slow_calls_open_the_breaker(provider):
+    provider.set("primary", delay=0.2)
+    breaker = CircuitBreaker(min_calls=3, slow_call_threshold=0.1, open_duration=60)
+    client = ResilientLLM(provider.model("primary"), breaker=breaker, timeout=2)
+
+    for _ in range(3):
+        asyncio.run(client.ainvoke(MESSAGES))
+
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def test_breaker_recovers_through_half_open(provider):
+    provider.set("primary", status=503)
+    breaker = CircuitBreaker(min_calls=2, open_duration=0.2)
+    client = ResilientLLM(provider.model("primary"), breaker=breaker, timeout=2)
+
+    for _ in range(2):
+        asyncio.run(client.ainvoke(MESSAGES))
+    assert breaker.state == CircuitBreaker.OPEN
+
+    provider.set("primary", content="recovered")
+    time.sleep(0.25)
+
+    assert asyncio.run(client.ainvoke(MESSAGES)) == "recovered"
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_cancelled_half_open_probe_releases_the_slot(provider):
+    provider.set("primary", delay=2.0)
+    breaker = CircuitBreaker(min_calls=1, open_duration=0.1)
+    breaker._open()
+    time.sleep(0.15)
+    client = ResilientLLM(provider.model("primary"), breaker=breaker, timeout=5)
+
+    async def cancel_probe():
+        task = asyncio.create_task(client.ainvoke(MESSAGES))
+        await asyncio.sleep(0.1)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    asyncio.run(cancel_probe())
+
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker._probe_in_flight
+
+    provider.set("primary", content="recovered")
+    time.sleep(0.15)
+
+    assert asyncio.run(client.ainvoke(MESSAGES)) == "recovered"
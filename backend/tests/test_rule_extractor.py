@@ -0,0 +1,95 @@
+# backend/tests/test_rule_extractor.py
+import asyncio
+
+from app.agents import extractor, reply_extractor
+from app.agents.rule_extractor import rule_based_extract
+from app.services.llm import CircuitBreaker, ResilientLLM
+
+EMAIL = """Hi,
+
+We're planning a conference in Austin, Texas from March 15, 2025 to March 17, 2025
+for 120 attendees and need 60 hotel rooms. Our budget is $50K.
+Call me on +1 512-555-0199 or write to jane.doe@acme.com.
+
+Best regards,
+Jane Doe"""
+
+
+def test_extracts_unambiguous_fields():
+    result = rule_based_extract(EMAIL)
+
+    assert result == {
+        "full_name": "Jane Doe",
+        "email": "jane.doe@acme.com",
+        "phone": "+1 512-555-0199",
+        "location": "Austin, Texas",
+        "event_name": None,
+        "event_type": "conference",
+        "number_of_attendees": 120,
+        "number_of_sleeping_rooms": 60,
+        "budget": "$50K",
+        "event_start_date": "2025-03-15",
+        "event_end_date": "2025-03-17"
+    }
+
+
+def test_lowercase_words_after_lead_in_are_not_names():
+    assert rule_based_extract("I'm looking for a venue")["full_name"] is None
+    assert rule_based_extract("This is our annual sales kickoff for 200 people")["full_name"] is None
+    assert rule_based_extract("Hello, my name is Priya Sharma.")["full_name"] == "Priya Sharma"
+
+
+def test_months_are_not_locations():
+    assert rule_based_extract("a conference in March 2025")["location"] is None
+    assert rule_based_extract("a summit in New York in June")["location"] == "New York"
+
+
+def test_ambiguous_locations_are_left_empty():
+    assert rule_based_extract("either in Paris or in Lyon")["location"] is None
+
+
+def test_event_type_needs_a_single_whole_word_match():
+    assert rule_based_extract(
+        "planning a workshop for 40 people and need two meeting rooms"
+    )["event_type"] == "workshop"
+    assert rule_based_extract("a conference followed by a gala dinner")["event_type"] is None
+    assert rule_based_extract("our team retraining day")["event_type"] is None
+
+
+def test_dotted_dates_are_dates_not_phones():
+    result = rule_based_extract("Seminar vom 10.06.2025 - 12.06.2025 in Berlin")
+
+    assert result["phone"] is None
+    assert result["event_start_date"] == "2025-06-10"
+    assert result["event_end_date"] == "2025-06-12"
+    assert result["location"] == "Berlin"
+
+
+def test_limits_result_to_requested_fields():
+    assert rule_based_extract(EMAIL, fields=["phone", "budget"]) == {
+        "phone": "+1 512-555-0199",
+        "budget": "$50K"
+    }
+
+
+def _open_circuit_client(provider):
+    breaker = CircuitBreaker(open_duration=60)
+    breaker._open()
+    return ResilientLLM(provider.model("primary"), breaker=breaker)
+
+
+def test_extractor_degrades_to_rules_when_circuit_open(provider, monkeypatch):
+    monkeypatch.setattr(extractor, "llm_client", _open_circuit_client(provider))
+
+    result = asyncio.run(extractor.extractor_agent(EMAIL))
+
+    assert result == rule_based_extract(EMAIL)
+    assert provider.count("primary") == 0
+
+
+def test_reply_extractor_degrades_to_rules_when_circuit_open(provider, monkeypatch):
+    monkeypatch.setattr(reply_extractor, "llm_client", _open_circuit_client(provider))
+
+    result = asyncio.run(reply_extractor.reply_extractor_agent(EMAIL, ["phone", "location"]))
+
+    assert result == {"phone": "+1 512-555-0199", "location": "Austin, Texas"}
@@ -0,0 +1,86 @@
+# backend/tests/test_tts.py
+import asyncio
+import gc
+import logging
+
+import pytest
+
+from app.services.tts import TextToSpeechService
+
+TEXT = "First sentence here. " + " ".join(f"Sentence number {i} is rather long and wordy." for i in range(40))
+
+
+def fake_synthesizer(delays, fail_on=(), state=None):
+    async def synthesize(self, text, voice, semaphore):
+        async with semaphore:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+            try:
+                index = state["calls"]
+                state["calls"] += 1
+                await asyncio.sleep(delays(index))
+                if index in fail_on:
+                    raise RuntimeError(f"chunk {index} failed")
+                return f"<{index}>".encode()
+            finally:
+                state["active"] -= 1
+    return synthesize
+
+
+@pytest.fixture
+def state():
+    return {"active": 0, "peak": 0, "calls": 0}
+
+
+async def collect(service, text):
+    return [chunk async for chunk in service.stream_speech(text)]
+
+
+def test_chunks_cover_whole_text():
+    chunks = TextToSpeechService.split_into_chunks(TEXT)
+
+    assert chunks[0] == "First sentence here."
+    assert all(len(chunk) <= 300 for chunk in chunks)
+    assert " ".join(chunks) == TEXT.strip()
+
+
+def test_voice_comes_from_language_config():
+    assert TextToSpeechService.get_voice("German") == "de-DE-KatjaNeural"
+    assert TextToSpeechService.get_voice("Klingon") == "en-US-AriaNeural"
+
+
+def test_stream_yields_in_order_with_bounded_concurrency(monkeypatch, state):
+    # Earlier chunks finish last, so ordering has to come from the stream
+    monkeypatch.setattr(
+        TextToSpeechService, "_synthesize", fake_synthesizer(lambda i: 0.05 / (i + 1), state=state)
+    )
+    service = TextToSpeechService(max_concurrency=2)
+
+    audio = asyncio.run(collect(service, TEXT))
+
+    expected = len(TextToSpeechService.split_into_chunks(TEXT))
+    assert audio == [f"<{i}>".encode() for i in range(expected)]
+    assert state["peak"] == 2
+
+
+def test_failed_chunk_is_logged_and_remaining_tasks_collected(monkeypatch, state, caplog):
+    monkeypatch.setattr(
+        TextToSpeechService, "_synthesize",
+        fake_synthesizer(lambda i: 0.01, fail_on={1, 2}, state=state)
+    )
+    service = TextToSpeechService(max_concurrency=4)
+    unretrieved = []
+
+    async def run():
+        asyncio.get_running_loop().set_exception_handler(lambda loop, context: unretrieved.append(context))
+        with pytest.raises(RuntimeError, match="chunk 1 failed"):
+            await collect(service, TEXT)
+        await asyncio.sleep(0.05)
+        # Unretrieved task exceptions are reported when the task is collected
+        gc.collect()
+
+    with caplog.at_level(logging.ERROR, logger="app.services.tts"):
+        asyncio.run(run())
+
+    assert "TTS chunk 2/" in caplog.text
+    assert not [context for context in unretrieved if "chunk" in str(context.get("exception"))]
@@ -19,31 +19,87 @@ const api = {
     return response.json();
   },
   
-  processReply: async (eventId, replyContent, roundNumber) => {
+  processReply: async (eventId, replyContent, roundNumber, messageId) => {
     const response = await fetch(`${API_BASE_URL}/api/process-reply`, {
       method: 'POST',
       headers: { 'Content-Type': 'application/json' },
       body: JSON.stringify({ 
         event_id: eventId, 
         reply_content: replyContent, 
-        round_number: roundNumber 
+        round_number: roundNumber,
+        message_id: messageId
       })
     });
     if (!response.ok) throw new Error('Failed to process reply');
     return response.json();
   },
   
-  textToSpeech: async (text, language) => {
-    const response = await fetch(`${API_BASE_URL}/api/text-to-speech`, {
+  // Returns the raw response so MP3 chunks can be played as they arrive
+  textToSpeechStream: async (text, language) => {
+    const response = await fetch(`${API_BASE_URL}/api/text-to-speech/stream`, {
       method: 'POST',
       headers: { 'Content-Type': 'application/json' },
       body: JSON.stringify({ text, language })
     });
     if (!response.ok) throw new Error('Failed to generate speech');
-    return response.json();
+    return response;
   }
 };
 
+// Client-side id for a reply, so the server can tell a retry from a new reply
+const newMessageId = () => (
+  window.crypto?.randomUUID
+    ? window.crypto.randomUUID()
+    : `${Date.now()}-${Math.random().toString(36).slice(2)}`
+);
+
+// Append a chunk to a MediaSource buffer and wait until it has been consumed
+const appendToBuffer = (sourceBuffer, chunk) => new Promise((resolve, reject) => {
+  sourceBuffer.addEventListener('updateend', resolve, { once: true });
+  sourceBuffer.addEventListener('error', reject, { once: true });
+  sourceBuffer.appendBuffer(chunk);
+});
+
+// Start playing streamed MP3 audio before the whole response has arrived.
+// Falls back to buffering the full response where MediaSource can't play MP3.
+const playAudioStream = async (response, audio) => {
+  const canStream = window.MediaSource && MediaSource.isTypeSupported('audio/mpeg') && response.body;
+  
+  if (!canStream) {
+    const blob = await response.blob();
+    audio.src = URL.createObjectURL(blob);
+    await audio.play();
+    return;
+  }
+  
+  const mediaSource = new MediaSource();
+  audio.src = URL.createObjectURL(mediaSource);
+  
+  mediaSource.addEventListener('sourceopen', async () => {
+    const sourceBuffer = mediaSource.addSourceBuffer('audio/mpeg');
+    const reader = response.body.getReader();
+    try {
+      while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        // Stop downloading once playback has been stopped
+        if (audio.src === '') {
+          reader.cancel();
+          break;
+        }
+        await appendToBuffer(sourceBuffer, value);
+      }
+      if (mediaSource.readyState === 'open') mediaSource.endOfStream();
+    } catch (error) {
+      console.error('Speech stream error:', error);
+      reader.cancel();
+      if (mediaSource.readyState === 'open') mediaSource.endOfStream('network');
+    }
+  }, { once: true });
+  
+  await audio.play();
+};
+
 // Language configurations
 const languages = {
   English: { flag: '🇺🇸', name: 'English', voice: 'Aria' },
@@ -226,6 +282,7 @@ const EmailDisplay = ({ email, title, type = 'followup', language, eventData })
     if (isSpeaking) {
       if (audioRef.current) {
         audioRef.current.pause();
+        audioRef.current.removeAttribute('src');
         audioRef.current = null;
       }
       setIsSpeaking(false);
@@ -234,18 +291,20 @@ const EmailDisplay = ({ email, title, type = 'followup', language, eventData })
     
     try {
       setIsSpeaking(true);
-      const response = await api.textToSpeech(email, language);
+      const response = await api.textToSpeechStream(email, language);
       
-      // Convert base64 to audio and play
-      const audio = new Audio(`data:audio/mp3;base64,${response.audio_base64}`);
+      // Play sentence chunks as they arrive instead of waiting for the whole message
+      const audio = new Audio();
       audioRef.current = audio;
       
       audio.onended = () => {
         setIsSpeaking(false);
         audioRef.current = null;
       };
+      // A stream cut off mid-message ends playback with an error rather than "ended"
+      audio.onerror = audio.onended;
       
-      await audio.play();
+      await playAudioStream(response, audio);
     } catch (error) {
       console.error('Speech error:', error);
       setIsSpeaking(false);
@@ -422,6 +481,8 @@ export default function AIMEMeetingPlanner() {
   const [error, setError] = useState(null);
   const [activeTab, setActiveTab] = useState('input');
   const [showTips, setShowTips] = useState(true);
+  // Id of the reply being submitted; kept across retries of the same text
+  const pendingReply = useRef(null);
 
   // Sample email for demo
   const sampleEmail = `Dear Team,
@@ -466,12 +527,18 @@ XYZ Corporation`;
     setIsProcessing(true);
     setError(null);
 
+    if (!pendingReply.current || pendingReply.current.content !== replyContent) {
+      pendingReply.current = { content: replyContent, messageId: newMessageId() };
+    }
+
     try {
       const result = await api.processReply(
         currentEvent.event_id,
         replyContent,
-        currentEvent.round_number
+        currentEvent.round_number,
+        pendingReply.current.messageId
       );
+      pendingReply.current = null;
       setCurrentEvent(result);
       setReplyContent('');
       setActiveTab('results');